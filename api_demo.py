@@ -8,6 +8,13 @@ All classes and functions are available directly from the main package.
 # Everything you need in one import!
 from wasmadis import *  # noqa: F403,F405
 
+# Constant for a given wasmadis version, so computed once at import time.
+_OPCODE_COUNT = len(Opcode)
+_ATOMIC_COUNT = len(AtomicOpcode)
+_GC_COUNT = len(GCOpcode)
+_VAL_TYPE_NAMES = tuple(t.name for t in ValType)
+_SECTION_NAMES = tuple(t.name for t in SectionId)
+
 
 def main():
     print('🚀 wasmadis API Demo - Simplified Imports')
@@ -64,13 +71,13 @@ def main():
     print(f'📦 Binary module size: {len(binary)} bytes')
 
     # 6. Show available opcodes
-    print(f'\n🎯 Available instruction opcodes: {len(Opcode)} standard')
-    print(f'⚛️  Atomic opcodes: {len(AtomicOpcode)}')
-    print(f'🗑️  GC opcodes: {len(GCOpcode)}')
+    print(f'\n🎯 Available instruction opcodes: {_OPCODE_COUNT} standard')
+    print(f'⚛️  Atomic opcodes: {_ATOMIC_COUNT}')
+    print(f'🗑️  GC opcodes: {_GC_COUNT}')
 
     # 7. Demonstrate other features
-    print(f'\n🔧 Value types: {[t.name for t in ValType]}')
-    print(f'📂 Section types: {[t.name for t in SectionId]}')
+    print(f'\n🔧 Value types: {list(_VAL_TYPE_NAMES)}')
+    print(f'📂 Section types: {list(_SECTION_NAMES)}')
 
     print('\n✅ All features accessible from a single import!')
     print('   No more complex subpackage imports needed!')
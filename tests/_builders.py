@@ -0,0 +1,284 @@
+import functools
+
+from wasmadis import FuncBuilder, Module, encode_binary
+from wasmadis.instructions import (
+    AtomicOpcode,
+    BlockInstruction,
+    CallInstruction,
+    ConstInstruction,
+    GCOpcode,
+    IfInstruction,
+    Instruction,
+    LocalInstruction,
+    Opcode,
+)
+from wasmadis.sections import (
+    CodeSection,
+    Export,
+    ExportSection,
+    Func,
+    FuncExportDesc,
+    FuncImportDesc,
+    FunctionSection,
+    ImportSection,
+    Locals,
+    TypeSection,
+)
+from wasmadis.types import FuncType, ValType
+
+
+# Shared instructions; the encoder only reads them, so one instance can appear
+# any number of times in any number of bodies.
+UNREACHABLE = Instruction(opcode=Opcode.UNREACHABLE)
+RETURN = Instruction(opcode=Opcode.RETURN)
+I32_LT_S = Instruction(opcode=Opcode.I32_LT_S)
+I32_GT_S = Instruction(opcode=Opcode.I32_GT_S)
+I32_LE_S = Instruction(opcode=Opcode.I32_LE_S)
+I32_GE_U = Instruction(opcode=Opcode.I32_GE_U)
+I32_ADD = Instruction(opcode=Opcode.I32_ADD)
+I32_SUB = Instruction(opcode=Opcode.I32_SUB)
+I32_MUL = Instruction(opcode=Opcode.I32_MUL)
+I32_SHL = Instruction(opcode=Opcode.I32_SHL)
+
+_LOCAL_GETS = tuple(LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=idx) for idx in range(4))
+LOCAL_GET_0, LOCAL_GET_1, LOCAL_GET_2, LOCAL_GET_3 = _LOCAL_GETS
+
+
+@functools.cache
+def i32_const(value):
+    """Shared ``i32.const value`` instruction."""
+    return ConstInstruction(opcode=Opcode.I32_CONST, value=value)
+
+
+def single_func_module(name, func_type, body, locals=None):
+    """Build a module with one function of ``func_type`` exported as ``name``."""
+    module = Module()
+    module.add_section(TypeSection(types=[func_type]))
+    module.add_section(FunctionSection(type_indices=[0]))
+    module.add_section(ExportSection(exports=[Export(name=name, desc=FuncExportDesc(func_idx=0))]))
+    module.add_section(CodeSection(funcs=[Func(locals=locals or [], body=body)]))
+    return module
+
+
+# Instructions whose effects may outlive the call that executes them. Anything touching tables,
+# memory or data/element segments counts, even reads like memory.size, so opcodes added to the
+# enums later are covered by default. Every AtomicOpcode is treated as stateful too.
+_STATEFUL_OPCODES = frozenset(
+    [
+        Opcode.GLOBAL_SET,
+        # The callee is only known at run time
+        Opcode.CALL_INDIRECT,
+        Opcode.RETURN_CALL_INDIRECT,
+        *(op for op in Opcode if op.name.startswith(('TABLE_', 'MEMORY_', 'DATA_', 'ELEM_'))),
+        *(op for op in Opcode if Opcode.I32_STORE.value <= op.value <= Opcode.I64_STORE32.value),
+        GCOpcode.STRUCT_SET,
+        GCOpcode.ARRAY_SET,
+        GCOpcode.ARRAY_FILL,
+        GCOpcode.ARRAY_COPY,
+        GCOpcode.ARRAY_INIT_DATA,
+        GCOpcode.ARRAY_INIT_ELEM,
+    ]
+)
+_DIRECT_CALLS = (Opcode.CALL, Opcode.RETURN_CALL)
+
+
+def _walk(instructions):
+    for instr in instructions:
+        yield instr
+        if isinstance(instr, BlockInstruction):
+            yield from _walk(instr.instructions)
+        elif isinstance(instr, IfInstruction):
+            yield from _walk(instr.then_instructions)
+            yield from _walk(instr.else_instructions or ())
+
+
+def is_pure(module):
+    """Whether no function in ``module`` can write globals, tables or memory.
+
+    The check is conservative: calls through a table and calls to imported functions count as
+    impure, since their effects cannot be seen here. Instances of a pure module can be shared
+    between tests, since calls leave nothing behind.
+    """
+    imported_funcs = sum(
+        isinstance(imp.desc, FuncImportDesc)
+        for section in module.sections
+        if isinstance(section, ImportSection)
+        for imp in section.imports
+    )
+    for section in module.sections:
+        if isinstance(section, CodeSection):
+            for func in section.funcs:
+                body = func.body
+                if isinstance(body, FuncBuilder):
+                    body = body.to_instructions()
+                for instr in _walk(body):
+                    if isinstance(instr.opcode, AtomicOpcode) or instr.opcode in _STATEFUL_OPCODES:
+                        return False
+                    if instr.opcode in _DIRECT_CALLS and instr.func_idx < imported_funcs:
+                        return False
+    return True
+
+
+def exports_for(*names):
+    """Export section exporting functions ``0, 1, ...`` under ``names``, in order."""
+    return ExportSection(
+        exports=[
+            Export(name=name, desc=FuncExportDesc(func_idx=func_idx))
+            for func_idx, name in enumerate(names)
+        ]
+    )
+
+
+def build_ops_module(specs):
+    """Build a module with one exported function per ``(name, params, results, opcodes)`` spec.
+
+    Each function pushes its (at most four) params in order, then runs ``opcodes``.
+    Functions with the same signature share a type entry.
+    """
+    module = Module()
+    type_section = TypeSection(types=[])
+    type_indices = []
+    funcs = []
+    for _, params, results, opcodes in specs:
+        func_type = FuncType(params=list(params), results=list(results))
+        type_indices.append(type_section.add_type(func_type))
+        body = _LOCAL_GETS[: len(params)] + tuple(Instruction(opcode=opcode) for opcode in opcodes)
+        funcs.append(Func(locals=[], body=body))
+    module.add_section(type_section)
+    module.add_section(FunctionSection(type_indices=type_indices))
+    module.add_section(exports_for(*(spec[0] for spec in specs)))
+    module.add_section(CodeSection(funcs=funcs))
+    return module
+
+
+@functools.cache
+def encode_ops_module(specs):
+    """Encoded ``build_ops_module(specs)``, memoized; ``specs`` must be nested tuples."""
+    return encode_binary(build_ops_module(specs))
+
+
+def build_identity_module():
+    """identity(x) -> x"""
+    return single_func_module(
+        'identity',
+        FuncType(params=[ValType.I32], results=[ValType.I32]),
+        [
+            LOCAL_GET_0,
+        ],
+    )
+
+
+def build_abs_module():
+    """abs(x) -> |x|, using if/else."""
+    return single_func_module(
+        'abs',
+        FuncType(params=[ValType.I32], results=[ValType.I32]),
+        [
+            LOCAL_GET_0,
+            i32_const(0),
+            I32_LT_S,
+            IfInstruction(
+                opcode=Opcode.IF,
+                block_type=ValType.I32,
+                then_instructions=[
+                    i32_const(0),
+                    LOCAL_GET_0,
+                    I32_SUB,
+                ],
+                else_instructions=[
+                    LOCAL_GET_0,
+                ],
+            ),
+        ],
+    )
+
+
+def build_swap_add_module():
+    """swap_add(a, b) -> b + a, routed through two locals."""
+    return single_func_module(
+        'swap_add',
+        FuncType(params=[ValType.I32, ValType.I32], results=[ValType.I32]),
+        [
+            # Store params in locals (swapped)
+            LOCAL_GET_1,  # param 1
+            LocalInstruction(opcode=Opcode.LOCAL_SET, local_idx=2),  # local 0
+            LOCAL_GET_0,  # param 0
+            LocalInstruction(opcode=Opcode.LOCAL_SET, local_idx=3),  # local 1
+            # Add swapped values
+            LOCAL_GET_2,  # local 0
+            LOCAL_GET_3,  # local 1
+            I32_ADD,
+        ],
+        locals=[
+            Locals(count=2, val_type=ValType.I32),  # Two local i32 variables
+        ],
+    )
+
+
+def build_double_module():
+    """double(x) -> add(x, x), where add is an internal, unexported function."""
+    module = Module()
+
+    add_type = FuncType(params=[ValType.I32, ValType.I32], results=[ValType.I32])
+    double_type = FuncType(params=[ValType.I32], results=[ValType.I32])
+    module.add_section(TypeSection(types=[add_type, double_type]))
+    module.add_section(FunctionSection(type_indices=[0, 1]))
+
+    # Only export the second function
+    module.add_section(
+        ExportSection(exports=[Export(name='double', desc=FuncExportDesc(func_idx=1))])
+    )
+
+    add_func = Func(
+        locals=[],
+        body=[
+            LOCAL_GET_0,
+            LOCAL_GET_1,
+            I32_ADD,
+        ],
+    )
+    double_func = Func(
+        locals=[],
+        body=[
+            LOCAL_GET_0,
+            LOCAL_GET_0,
+            CallInstruction(opcode=Opcode.CALL, func_idx=0),  # Call the add function
+        ],
+    )
+    module.add_section(CodeSection(funcs=[add_func, double_func]))
+    return module
+
+
+def build_tail_call_module():
+    """Two functions sharing one type, with ``factorial`` simplified to return its input."""
+    module = Module()
+
+    func_type = FuncType(params=[ValType.I32], results=[ValType.I32])
+    module.add_section(TypeSection(types=[func_type]))
+    module.add_section(FunctionSection(type_indices=[0, 0]))
+    module.add_section(
+        ExportSection(exports=[Export(name='factorial', desc=FuncExportDesc(func_idx=0))])
+    )
+
+    factorial_func = Func(
+        locals=[],
+        body=[
+            LOCAL_GET_0,
+            i32_const(1),
+            I32_LE_S,
+            # Simplified: just return the value instead of complex control flow
+            LOCAL_GET_0,
+            # Not redundant: the comparison result is still on the stack
+            RETURN,
+        ],
+    )
+    helper_func = Func(
+        locals=[],
+        body=[
+            LOCAL_GET_0,
+            i32_const(1),
+            I32_ADD,
+        ],
+    )
+    module.add_section(CodeSection(funcs=[factorial_func, helper_func]))
+    return module
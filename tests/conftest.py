@@ -0,0 +1,137 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+ARTIFACTS_DIR = Path(__file__).parent / '_artifacts'
+
+
+@pytest.fixture(scope='session')
+def encode_buffer():
+    """One bytearray reused for ``encode_binary(module, out=...)``; clear it before use."""
+    return bytearray()
+
+
+@pytest.fixture(scope='session')
+def wasmtime():
+    """The ``wasmtime`` module, for tests in modules that do not import it themselves.
+
+    Modules made up of runtime tests import it with ``pytest.importorskip``
+    and are skipped as a whole when wasmtime is not installed; elsewhere only
+    the tests that request this fixture (or one built on it) are skipped.
+    """
+    return pytest.importorskip('wasmtime')
+
+
+@pytest.fixture(scope='session')
+def engine(wasmtime):
+    """Shared wasmtime engine for the whole test session.
+
+    The test modules are tiny and only checked for semantics, so the
+    unoptimized Cranelift pipeline is used to keep compile time down. The
+    global compilation cache lets repeated runs skip Cranelift entirely for
+    modules whose encoding has not changed.
+    """
+    config = wasmtime.Config()
+    config.cranelift_opt_level = 'none'
+    config.cache = True
+    engine = wasmtime.Engine(config)
+    # Compile an empty module up front so the first real test does not pay
+    # for the engine's one-time lazy initialization.
+    wasmtime.Module(engine, b'\x00asm\x01\x00\x00\x00')
+    return engine
+
+
+@pytest.fixture(scope='session')
+def fast_execute_engine(wasmtime):
+    """Engine with full Cranelift optimization, for tests that call into wasm repeatedly."""
+    config = wasmtime.Config()
+    config.cranelift_opt_level = 'speed'
+    config.cache = True
+    return wasmtime.Engine(config)
+
+
+# Minimal module declaring one empty struct type; only valid when GC is enabled.
+GC_PROBE_MODULE = b'\x00asm\x01\x00\x00\x00' + b'\x01\x03\x01\x5f\x00'
+
+
+@pytest.fixture(scope='session')
+def gc_engine(wasmtime):
+    """Engine with the GC proposal enabled; skips dependent tests if unsupported.
+
+    Support is probed once per session, so GC tests skip before building or
+    encoding anything when the installed wasmtime lacks GC.
+    """
+    try:
+        config = wasmtime.Config()
+        config.wasm_gc = True
+        config.wasm_function_references = True
+        config.cache = True
+        engine = wasmtime.Engine(config)
+        wasmtime.Module(engine, GC_PROBE_MODULE)
+    except (AttributeError, wasmtime.WasmtimeError) as e:
+        pytest.skip(f'wasmtime lacks GC support: {e}')
+    return engine
+
+
+@pytest.fixture
+def store(engine, wasmtime):
+    """A fresh store per test, so instances and memories never leak between tests."""
+    return wasmtime.Store(engine)
+
+
+@pytest.fixture(scope='session')
+def compiled(engine, wasmtime):
+    """Return ``compile(binary_data) -> wasmtime.Module``, memoized per session.
+
+    Identical encodings are only run through Cranelift once; later calls get
+    the already-compiled module back. Compiled code is also kept on disk in
+    ``tests/_artifacts`` as ``<sha256>.cwasm``, so later runs only deserialize.
+    """
+    cache: dict[bytes, Any] = {}
+
+    def load(key):
+        path = ARTIFACTS_DIR / f'{hashlib.sha256(key).hexdigest()}.cwasm'
+        if path.exists():
+            try:
+                return wasmtime.Module.deserialize_file(engine, str(path))
+            except wasmtime.WasmtimeError:
+                pass  # Built by another wasmtime version or config; recompile
+        module = wasmtime.Module(engine, key)
+        ARTIFACTS_DIR.mkdir(exist_ok=True)
+        # Write then rename, so concurrent xdist workers never see a partial file
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(module.serialize())
+        os.replace(tmp_path, path)
+        return module
+
+    def compile(binary_data):
+        key = bytes(binary_data)
+        module = cache.get(key)
+        if module is None:
+            module = cache[key] = load(key)
+        return module
+
+    return compile
+
+
+@pytest.fixture(scope='session')
+def instance_pre(compiled, engine, wasmtime):
+    """Return ``pre(binary_data) -> wasmtime.InstancePre`` for modules without imports.
+
+    Import resolution and type checking happen once per module; each test then
+    only pays for ``pre.instantiate(store)``.
+    """
+    linker = wasmtime.Linker(engine)
+    cache: dict[Any, Any] = {}
+
+    def pre(binary_data):
+        module = compiled(binary_data)
+        result = cache.get(module)
+        if result is None:
+            result = cache[module] = linker.instantiate_pre(module)
+        return result
+
+    return pre
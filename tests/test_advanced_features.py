@@ -1,76 +1,63 @@
 import pytest
-import wasmtime
-
-from wasmadis import Module, encode_binary
-from wasmadis.instructions import (
-    ConstInstruction,
-    Instruction,
-    LocalInstruction,
-    Opcode,
-)
-from wasmadis.sections import (
-    CodeSection,
-    Export,
-    ExportSection,
-    Func,
-    FuncExportDesc,
-    FunctionSection,
-    TypeSection,
+
+from wasmadis import encode_binary
+
+from tests._builders import (
+    build_abs_module,
+    build_double_module,
+    build_identity_module,
+    build_swap_add_module,
+    build_tail_call_module,
 )
-from wasmadis.types import FuncType, ValType
 
+wasmtime = pytest.importorskip('wasmtime')
+
+
+@pytest.fixture(scope='module')
+def tail_call_binary():
+    return encode_binary(build_tail_call_module())
+
+
+@pytest.fixture(scope='module')
+def abs_binary():
+    return encode_binary(build_abs_module())
+
+
+@pytest.fixture(scope='module')
+def abs_instance(engine, abs_binary):
+    """Store and exported ``abs`` function, instantiated once for all parameters."""
+    store = wasmtime.Store(engine)
+    instance = wasmtime.Instance(store, wasmtime.Module(engine, abs_binary), [])
+    return store, instance.exports(store)['abs']
+
+
+@pytest.fixture(scope='module')
+def swap_add_binary():
+    return encode_binary(build_swap_add_module())
+
+
+@pytest.fixture(scope='module')
+def double_binary():
+    return encode_binary(build_double_module())
+
+
+@pytest.fixture(scope='module')
+def double_instance(engine, double_binary):
+    """Store and exported ``double`` function, instantiated once for all parameters."""
+    store = wasmtime.Store(engine)
+    instance = wasmtime.Instance(store, wasmtime.Module(engine, double_binary), [])
+    return store, instance.exports(store)['double']
+
+
+@pytest.fixture(scope='module')
+def identity_binary():
+    return encode_binary(build_identity_module())
 
-def test_tail_call_module_structure():
-    """Test that a tail call module has correct structure (even if not fully executable)."""
-    module = Module()
-
-    # Type section
-    func_type = FuncType(params=[ValType.I32], results=[ValType.I32])
-    type_section = TypeSection(types=[func_type])
-    module.add_section(type_section)
-
-    # Function section - two functions
-    function_section = FunctionSection(type_indices=[0, 0])
-    module.add_section(function_section)
-
-    # Export section
-    export_section = ExportSection(
-        exports=[Export(name='factorial', desc=FuncExportDesc(func_idx=0))]
-    )
-    module.add_section(export_section)
-
-    # Code section with tail call
-    factorial_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            ConstInstruction(opcode=Opcode.I32_CONST, value=1),
-            Instruction(opcode=Opcode.I32_LE_S),
-            # Simplified: just return the value instead of complex control flow
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-
-    helper_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            ConstInstruction(opcode=Opcode.I32_CONST, value=1),
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-
-    code_section = CodeSection(funcs=[factorial_func, helper_func])
-    module.add_section(code_section)
-
-    # Encode to binary
-    binary_data = encode_binary(module)
 
+def test_tail_call_module_structure(engine, tail_call_binary):
+    """Test that a tail call module has correct structure (even if not fully executable)."""
     # Validate module structure
-    engine = wasmtime.Engine()
-    wasmtime_module = wasmtime.Module(engine, binary_data)
+    wasmtime_module = wasmtime.Module(engine, tail_call_binary)
 
     # Test basic functionality
     store = wasmtime.Store(engine)
@@ -82,112 +69,16 @@ def test_tail_call_module_structure():
     assert result == 5
 
 
-def test_complex_control_flow():
+@pytest.mark.parametrize('x,expected', [(5, 5), (-5, 5), (0, 0)])
+def test_complex_control_flow(abs_instance, x, expected):
     """Test a module with complex control flow structures."""
-    module = Module()
-
-    # Type section
-    func_type = FuncType(params=[ValType.I32], results=[ValType.I32])
-    type_section = TypeSection(types=[func_type])
-    module.add_section(type_section)
-
-    # Function section
-    function_section = FunctionSection(type_indices=[0])
-    module.add_section(function_section)
-
-    # Export section
-    export_section = ExportSection(exports=[Export(name='abs', desc=FuncExportDesc(func_idx=0))])
-    module.add_section(export_section)
-
-    # Code section - absolute value function using if/else
-    from wasmadis.instructions import IfInstruction
-
-    abs_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            ConstInstruction(opcode=Opcode.I32_CONST, value=0),
-            Instruction(opcode=Opcode.I32_LT_S),
-            IfInstruction(
-                opcode=Opcode.IF,
-                block_type=ValType.I32,
-                then_instructions=[
-                    ConstInstruction(opcode=Opcode.I32_CONST, value=0),
-                    LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-                    Instruction(opcode=Opcode.I32_SUB),
-                ],
-                else_instructions=[
-                    LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-                ],
-            ),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-    code_section = CodeSection(funcs=[abs_func])
-    module.add_section(code_section)
-
-    # Encode and validate
-    binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
-    wasmtime_module = wasmtime.Module(engine, binary_data)
-
-    # Test the function
-    store = wasmtime.Store(engine)
-    instance = wasmtime.Instance(store, wasmtime_module, [])
-    abs_func = instance.exports(store)['abs']
-
-    # Test positive and negative numbers
-    assert abs_func(store, 5) == 5
-    assert abs_func(store, -5) == 5
-    assert abs_func(store, 0) == 0
+    store, abs_func = abs_instance
+    assert abs_func(store, x) == expected
 
 
-def test_local_variables():
+def test_local_variables(engine, swap_add_binary):
     """Test a function that uses local variables."""
-    module = Module()
-
-    # Type section
-    func_type = FuncType(params=[ValType.I32, ValType.I32], results=[ValType.I32])
-    type_section = TypeSection(types=[func_type])
-    module.add_section(type_section)
-
-    # Function section
-    function_section = FunctionSection(type_indices=[0])
-    module.add_section(function_section)
-
-    # Export section
-    export_section = ExportSection(
-        exports=[Export(name='swap_add', desc=FuncExportDesc(func_idx=0))]
-    )
-    module.add_section(export_section)
-
-    # Code section - function with local variables
-    from wasmadis.sections import Locals
-
-    swap_add_func = Func(
-        locals=[
-            Locals(count=2, val_type=ValType.I32),  # Two local i32 variables
-        ],
-        body=[
-            # Store params in locals (swapped)
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),  # param 1
-            LocalInstruction(opcode=Opcode.LOCAL_SET, local_idx=2),  # local 0
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),  # param 0
-            LocalInstruction(opcode=Opcode.LOCAL_SET, local_idx=3),  # local 1
-            # Add swapped values
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=2),  # local 0
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=3),  # local 1
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-    code_section = CodeSection(funcs=[swap_add_func])
-    module.add_section(code_section)
-
-    # Encode and validate
-    binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
-    wasmtime_module = wasmtime.Module(engine, binary_data)
+    wasmtime_module = wasmtime.Module(engine, swap_add_binary)
 
     # Test the function
     store = wasmtime.Store(engine)
@@ -199,106 +90,21 @@ def test_local_variables():
     assert result == 10
 
 
-def test_function_calls():
+@pytest.mark.parametrize('x,expected', [(5, 10), (7, 14), (0, 0)])
+def test_function_calls(double_instance, x, expected):
     """Test a module with function calls between internal functions."""
-    module = Module()
-
-    # Type section
-    add_type = FuncType(params=[ValType.I32, ValType.I32], results=[ValType.I32])
-    double_type = FuncType(params=[ValType.I32], results=[ValType.I32])
-    type_section = TypeSection(types=[add_type, double_type])
-    module.add_section(type_section)
-
-    # Function section - two functions
-    function_section = FunctionSection(type_indices=[0, 1])
-    module.add_section(function_section)
-
-    # Export section - only export the second function
-    export_section = ExportSection(exports=[Export(name='double', desc=FuncExportDesc(func_idx=1))])
-    module.add_section(export_section)
-
-    # Code section
-    from wasmadis.instructions import CallInstruction
-
-    # Internal add function
-    add_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-
-    # Double function that calls add
-    double_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            CallInstruction(opcode=Opcode.CALL, func_idx=0),  # Call the add function
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-
-    code_section = CodeSection(funcs=[add_func, double_func])
-    module.add_section(code_section)
-
-    # Encode and validate
-    binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
-    wasmtime_module = wasmtime.Module(engine, binary_data)
-
-    # Test the function
-    store = wasmtime.Store(engine)
-    instance = wasmtime.Instance(store, wasmtime_module, [])
-    double_func = instance.exports(store)['double']
+    store, double_func = double_instance
+    assert double_func(store, x) == expected
 
-    # Test that double works correctly
-    assert double_func(store, 5) == 10
-    assert double_func(store, 7) == 14
-    assert double_func(store, 0) == 0
 
-
-def test_binary_size_efficiency():
+def test_binary_size_efficiency(engine, identity_binary):
     """Test that our binary encoding produces reasonably sized output."""
-    module = Module()
-
-    # Simple function
-    func_type = FuncType(params=[ValType.I32], results=[ValType.I32])
-    type_section = TypeSection(types=[func_type])
-    module.add_section(type_section)
-
-    function_section = FunctionSection(type_indices=[0])
-    module.add_section(function_section)
-
-    export_section = ExportSection(
-        exports=[Export(name='identity', desc=FuncExportDesc(func_idx=0))]
-    )
-    module.add_section(export_section)
-
-    # Identity function - just return input
-    identity_func = Func(
-        locals=[],
-        body=[
-            LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-    code_section = CodeSection(funcs=[identity_func])
-    module.add_section(code_section)
-
-    # Encode to binary
-    binary_data = encode_binary(module)
-
     # Check that binary size is reasonable (should be quite small for this simple module)
-    assert len(binary_data) < 100  # Should be well under 100 bytes
-    assert len(binary_data) > 20  # But not too small (should have proper structure)
+    assert len(identity_binary) < 100  # Should be well under 100 bytes
+    assert len(identity_binary) > 20  # But not too small (should have proper structure)
 
     # Validate it works
-    engine = wasmtime.Engine()
-    wasmtime_module = wasmtime.Module(engine, binary_data)
+    wasmtime_module = wasmtime.Module(engine, identity_binary)
     store = wasmtime.Store(engine)
     instance = wasmtime.Instance(store, wasmtime_module, [])
     identity_func = instance.exports(store)['identity']
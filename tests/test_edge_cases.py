@@ -1,8 +1,15 @@
 import pytest
-import wasmtime
 
-from wasmadis import Module, encode_binary, encode_text
-from wasmadis.instructions import ConstInstruction, Instruction, Opcode
+from wasmadis import Module, encode_binary, encode_sleb128, encode_text, encode_uleb128
+from wasmadis.binary_encoder import encode_instruction
+from wasmadis.instructions import (
+    BlockInstruction,
+    BrInstruction,
+    ConstInstruction,
+    IfInstruction,
+    Instruction,
+    Opcode,
+)
 from wasmadis.sections import (
     CodeSection,
     Export,
@@ -14,25 +21,31 @@ from wasmadis.sections import (
 )
 from wasmadis.types import FuncType, ValType
 
+from tests._builders import I32_ADD, UNREACHABLE, i32_const
 
-def test_empty_module():
-    """Test that an empty module can be encoded and is valid."""
-    module = Module()
 
+@pytest.fixture(scope='module')
+def empty_module():
+    """An empty module and its encoding, shared by the header tests."""
+    module = Module(version=1)
+    return module, encode_binary(module)
+
+
+def test_empty_module(engine, wasmtime, empty_module):
+    """Test that an empty module can be encoded and is valid."""
     # An empty module should still be valid WASM
-    binary_data = encode_binary(module)
+    module, binary_data = empty_module
 
     # Should contain at least the magic number and version
     assert len(binary_data) >= 8
     assert binary_data[:4] == b'\x00asm'
 
     # Should be valid according to wasmtime
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
     assert wasmtime_module is not None
 
 
-def test_module_with_only_types():
+def test_module_with_only_types(engine, wasmtime):
     """Test a module that only has a type section."""
     module = Module()
 
@@ -43,7 +56,6 @@ def test_module_with_only_types():
     module.add_section(type_section)
 
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
     assert wasmtime_module is not None
 
@@ -71,7 +83,7 @@ def test_function_with_no_instructions():
     assert len(binary_data) > 8  # More than just header
 
 
-def test_function_with_unreachable():
+def test_function_with_unreachable(engine, wasmtime):
     """Test a function that starts with unreachable instruction."""
     module = Module()
 
@@ -94,9 +106,8 @@ def test_function_with_unreachable():
     unreachable_func = Func(
         locals=[],
         body=[
-            Instruction(opcode=Opcode.UNREACHABLE),
+            UNREACHABLE,
             ConstInstruction(opcode=Opcode.I32_CONST, value=42),  # Dead code
-            Instruction(opcode=Opcode.RETURN),
         ],
     )
     code_section = CodeSection(funcs=[unreachable_func])
@@ -104,7 +115,6 @@ def test_function_with_unreachable():
 
     # Encode and validate structure
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     # The function should exist but trap when called
@@ -117,8 +127,16 @@ def test_function_with_unreachable():
         unreachable_func(store)
 
 
-def test_large_constants():
-    """Test functions with large constant values."""
+LARGE_I64_CONSTANTS = [
+    9223372036854775807,  # Max i64
+    -9223372036854775808,  # Min i64
+    4294967296,  # Just past u32
+]
+
+
+@pytest.fixture(scope='module')
+def large_const_instance(engine, wasmtime):
+    """One instance exporting ``large_const_<i>`` for each of LARGE_I64_CONSTANTS."""
     module = Module()
 
     # Type section
@@ -127,40 +145,50 @@ def test_large_constants():
     module.add_section(type_section)
 
     # Function section
-    function_section = FunctionSection(type_indices=[0])
+    function_section = FunctionSection(type_indices=[0] * len(LARGE_I64_CONSTANTS))
     module.add_section(function_section)
 
     # Export section
     export_section = ExportSection(
-        exports=[Export(name='large_const', desc=FuncExportDesc(func_idx=0))]
+        exports=[
+            Export(name=f'large_const_{i}', desc=FuncExportDesc(func_idx=i))
+            for i in range(len(LARGE_I64_CONSTANTS))
+        ]
     )
     module.add_section(export_section)
 
-    # Code section with large constant
-    large_const_func = Func(
-        locals=[],
-        body=[
-            ConstInstruction(opcode=Opcode.I64_CONST, value=9223372036854775807),  # Max i64
-            Instruction(opcode=Opcode.RETURN),
-        ],
-    )
-    code_section = CodeSection(funcs=[large_const_func])
+    # Code section with large constants
+    funcs = [
+        Func(
+            locals=[],
+            body=[
+                ConstInstruction(opcode=Opcode.I64_CONST, value=value),
+            ],
+        )
+        for value in LARGE_I64_CONSTANTS
+    ]
+    code_section = CodeSection(funcs=funcs)
     module.add_section(code_section)
 
-    # Encode and test
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     store = wasmtime.Store(engine)
     instance = wasmtime.Instance(store, wasmtime_module, [])
-    large_const_func = instance.exports(store)['large_const']
+    return store, instance.exports(store)
+
+
+@pytest.mark.parametrize('index,expected', list(enumerate(LARGE_I64_CONSTANTS)))
+def test_large_constants(large_const_instance, index, expected):
+    """Test functions with large constant values."""
+    store, exports = large_const_instance
+    large_const_func = exports[f'large_const_{index}']
 
     result = large_const_func(store)
-    assert result == 9223372036854775807
+    assert result == expected
 
 
-def test_negative_constants():
+def test_negative_constants(engine, wasmtime):
     """Test functions with negative constant values."""
     module = Module()
 
@@ -184,7 +212,6 @@ def test_negative_constants():
         locals=[],
         body=[
             ConstInstruction(opcode=Opcode.I32_CONST, value=-42),
-            Instruction(opcode=Opcode.RETURN),
         ],
     )
     code_section = CodeSection(funcs=[negative_const_func])
@@ -192,7 +219,6 @@ def test_negative_constants():
 
     # Encode and test
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     store = wasmtime.Store(engine)
@@ -203,6 +229,64 @@ def test_negative_constants():
     assert result == -42
 
 
+@pytest.mark.parametrize(
+    'value,expected',
+    [(0, b'\x00'), (127, b'\x7f'), (128, b'\x80\x01'), (624485, b'\xe5\x8e\x26')],
+)
+def test_uleb128_boundaries(value, expected):
+    """Test unsigned LEB128 on both sides of the single-byte fast path."""
+    assert encode_uleb128(value) == expected
+
+
+@pytest.mark.parametrize(
+    'value,expected',
+    [(0, b'\x00'), (63, b'\x3f'), (-64, b'\x40'), (64, b'\xc0\x00'), (-65, b'\xbf\x7f')],
+)
+def test_sleb128_boundaries(value, expected):
+    """Test signed LEB128 on both sides of the single-byte fast path."""
+    assert encode_sleb128(value) == expected
+
+
+@pytest.mark.parametrize(
+    'instr,expected',
+    [
+        (BlockInstruction(Opcode.BLOCK, None, []), '02 40 0b'),
+        (
+            BlockInstruction(Opcode.BLOCK, ValType.I32, [i32_const(1), i32_const(1), I32_ADD]),
+            '02 7f 41 01 41 01 6a 0b',
+        ),
+        (BlockInstruction(Opcode.LOOP, 3, [BrInstruction(Opcode.BR, 0)]), '03 03 0c 00 0b'),
+        (
+            BlockInstruction(Opcode.BLOCK, None, [BlockInstruction(Opcode.LOOP, None, [])]),
+            '02 40 03 40 0b 0b',
+        ),
+        (IfInstruction(Opcode.IF, None, [i32_const(1)]), '04 40 41 01 0b'),
+        (
+            IfInstruction(
+                Opcode.IF, ValType.I32, [i32_const(1)], [i32_const(1), i32_const(1), I32_ADD]
+            ),
+            '04 7f 41 01 05 41 01 41 01 6a 0b',
+        ),
+    ],
+    ids=['empty', 'result', 'loop-type-index', 'nested', 'if', 'if-else'],
+)
+def test_block_encoding(instr, expected):
+    """Test that structured bodies are plain instruction sequences closed by 0x0B, not vectors."""
+    assert encode_instruction(instr) == bytes.fromhex(expected)
+
+
+def test_type_section_add_type_deduplicates():
+    """Test that structurally equal types share a single type index."""
+    type_section = TypeSection(types=[])
+
+    first = type_section.add_type(FuncType(params=[ValType.I32], results=[ValType.I32]))
+    other = type_section.add_type(FuncType(params=[], results=[]))
+    again = type_section.add_type(FuncType(params=[ValType.I32], results=[ValType.I32]))
+
+    assert (first, other, again) == (0, 1, 0)
+    assert len(type_section.types) == 2
+
+
 def test_text_format_edge_cases():
     """Test text format generation with edge cases."""
     module = Module()
@@ -229,11 +313,24 @@ def test_text_format_edge_cases():
     assert 'result i32' in wat_text
 
 
-def test_module_version():
-    """Test that module version is correctly encoded."""
-    module = Module(version=1)
+def test_encode_binary_into_buffer(empty_module, encode_buffer):
+    """Test that encoding into a reused buffer matches the standalone encoding."""
+    module, binary_data = empty_module
 
-    binary_data = encode_binary(module)
+    encode_buffer.clear()
+    encode_buffer += b'prefix'
+    result = encode_binary(module, out=encode_buffer)
+
+    # The encoding is appended in place, after whatever the buffer held
+    assert result is encode_buffer
+    assert encode_buffer == b'prefix' + binary_data
+    assert isinstance(binary_data, bytes)
+
+
+def test_module_version(empty_module):
+    """Test that module version is correctly encoded."""
+    module, binary_data = empty_module
+    assert module.version == 1
 
     # Check magic number and version
     assert binary_data[:4] == b'\x00asm'
@@ -241,7 +338,7 @@ def test_module_version():
     assert binary_data[4:8] == b'\x01\x00\x00\x00'
 
 
-def test_very_simple_working_function():
+def test_very_simple_working_function(engine, wasmtime):
     """Test the simplest possible working function."""
     module = Module()
 
@@ -263,7 +360,6 @@ def test_very_simple_working_function():
         locals=[],
         body=[
             ConstInstruction(opcode=Opcode.I32_CONST, value=42),
-            Instruction(opcode=Opcode.RETURN),
         ],
     )
     code_section = CodeSection(funcs=[simple_func])
@@ -271,7 +367,6 @@ def test_very_simple_working_function():
 
     # Encode and test
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     store = wasmtime.Store(engine)
@@ -0,0 +1,205 @@
+import pytest
+
+from wasmadis import FuncBuilder, encode_binary, encode_text
+from wasmadis.binary_encoder import encode_expr
+from wasmadis.instructions import Opcode
+from wasmadis.types import FuncType, ValType
+
+from tests._builders import build_abs_module, single_func_module
+
+
+def build_abs_body():
+    """abs(x) -> |x|, matching build_abs_module."""
+    b = FuncBuilder()
+    b.local_get(0)
+    b.i32_const(0)
+    b.op(Opcode.I32_LT_S)
+    b.if_(ValType.I32)
+    b.i32_const(0)
+    b.local_get(0)
+    b.i32_sub()
+    b.else_()
+    b.local_get(0)
+    b.end()
+    return b
+
+
+def test_builder_matches_instruction_encoding():
+    """Test that a builder encodes to the same bytes as the equivalent Instruction list."""
+    builder = build_abs_body()
+    expected = build_abs_module()
+    actual = single_func_module(
+        'abs', FuncType(params=[ValType.I32], results=[ValType.I32]), builder
+    )
+
+    assert len(builder) == 10
+    assert encode_binary(actual) == encode_binary(expected)
+    assert encode_text(actual) == encode_text(expected)
+    assert encode_expr(builder.to_instructions()) == encode_expr(builder)
+    assert builder.to_instructions() == expected.sections[-1].funcs[0].body
+
+
+def build_every_immediate_kind():
+    """A body using every builder method, so every immediate kind appears at least once."""
+    b = FuncBuilder()
+    b.block(ValType.I32)
+    b.loop()
+    b.br(1)
+    b.br_if(0)
+    b.br_table([0, 1], 1)
+    b.end()
+    b.i32_const(-1)
+    b.end()
+    b.local_get(0)
+    b.if_(5)  # type index block type
+    b.call(1)
+    b.else_()
+    b.call_indirect(2, 1)
+    b.end()
+    b.local_set(1)
+    b.local_tee(2)
+    b.global_get(0)
+    b.global_set(1)
+    b.memory_op(Opcode.I64_LOAD, align=3, offset=300)
+    b.memory_op(Opcode.I32_STORE8, align=0)
+    b.memory_size()
+    b.memory_grow(1)
+    b.i64_const(-(1 << 40))
+    b.f32_const(1.5)
+    b.f64_const(-2.25)
+    b.op(Opcode.DROP)
+    b.return_call(3)
+    b.return_call_indirect(4)
+    return b
+
+
+def test_builder_round_trips_through_instructions():
+    """Test that to_instructions() keeps every immediate, so both forms encode identically."""
+    builder = build_every_immediate_kind()
+    instructions = builder.to_instructions()
+    assert encode_expr(instructions) == encode_expr(builder)
+    # memory.size and memory.grow keep their memory index
+    assert bytes([0x3F, 0x00, 0x40, 0x01]) in encode_expr(instructions)
+
+
+def test_builder_executes(engine, wasmtime):
+    """Test that a builder-backed function runs under wasmtime."""
+    b = FuncBuilder()
+    b.local_get(0)
+    b.i64_const(-(2**40))
+    b.op(Opcode.I64_ADD)
+    module = single_func_module(
+        'add_const', FuncType(params=[ValType.I64], results=[ValType.I64]), b
+    )
+
+    store = wasmtime.Store(engine)
+    instance = wasmtime.Instance(store, wasmtime.Module(engine, encode_binary(module)), [])
+    assert instance.exports(store)['add_const'](store, 2**40 + 7) == 7
+
+
+def test_builder_rejects_opcodes_with_immediates():
+    """Test that op() refuses opcodes whose immediates would be lost."""
+    b = FuncBuilder()
+    with pytest.raises(ValueError):
+        b.op(Opcode.LOCAL_GET)
+    with pytest.raises(ValueError):
+        b.op(Opcode.MEMORY_COPY)
+    with pytest.raises(ValueError):
+        b.memory_op(Opcode.I32_ADD, align=2)
+
+
+@pytest.mark.parametrize(
+    'opcode',
+    [
+        Opcode.SELECT_T,
+        Opcode.TABLE_GET,
+        Opcode.TABLE_SET,
+        Opcode.REF_NULL,
+        Opcode.REF_FUNC,
+        Opcode.BR_ON_NULL,
+        Opcode.BR_ON_NON_NULL,
+    ],
+    ids=lambda opcode: opcode.name,
+)
+def test_builder_rejects_unsupported_opcodes(opcode):
+    """Test that op() refuses opcodes with immediates the builder cannot write."""
+    b = FuncBuilder()
+    with pytest.raises(ValueError, match=opcode.name):
+        b.op(opcode)
+    assert len(b) == 0
+
+
+def test_builder_rejects_unbalanced_end():
+    """Test that end() needs an open block, via the method or op()."""
+    b = FuncBuilder()
+    with pytest.raises(ValueError, match='without an open block'):
+        b.end()
+    with pytest.raises(ValueError, match='without an open block'):
+        b.op(Opcode.END)
+    b.block()
+    b.end()
+    with pytest.raises(ValueError, match='without an open block'):
+        b.end()
+    assert len(b) == 2
+
+
+@pytest.mark.parametrize(
+    'open_block,message',
+    [
+        (lambda b: None, 'outside an if_'),
+        (FuncBuilder.block, 'outside an if_'),
+        (FuncBuilder.loop, 'outside an if_'),
+        (lambda b: (b.if_(), b.block()), 'outside an if_'),
+        (lambda b: (b.if_(), b.else_()), 'already has an else_'),
+    ],
+    ids=['no-block', 'block', 'loop', 'block-in-if', 'second-else'],
+)
+def test_builder_rejects_misplaced_else(open_block, message):
+    """Test that else_() is only accepted once, directly inside an if_()."""
+    b = FuncBuilder()
+    open_block(b)
+    size = len(b)
+    with pytest.raises(ValueError, match=message):
+        b.else_()
+    with pytest.raises(ValueError, match=message):
+        b.op(Opcode.ELSE)
+    assert len(b) == size
+
+
+@pytest.mark.parametrize(
+    'opcodes,message',
+    [
+        ([Opcode.END], 'without an open block'),
+        ([Opcode.ELSE], 'outside an if block'),
+        ([Opcode.BLOCK, Opcode.ELSE, Opcode.END], 'outside an if block'),
+        ([Opcode.LOOP, Opcode.ELSE, Opcode.END], 'outside an if block'),
+        ([Opcode.IF, Opcode.ELSE, Opcode.ELSE, Opcode.END], 'already has an else'),
+        ([Opcode.BLOCK], r'1 block\(s\) not closed'),
+        ([Opcode.IF, Opcode.BLOCK, Opcode.END], r'1 block\(s\) not closed'),
+    ],
+    ids=['end', 'else', 'else-in-block', 'else-in-loop', 'second-else', 'open', 'open-if'],
+)
+def test_edited_opcodes_are_checked(opcodes, message):
+    """Test that bodies edited through the opcode array are checked on encoding and expansion."""
+    b = FuncBuilder()
+    for opcode in opcodes:
+        b.opcodes.append(opcode.value)
+        if opcode in (Opcode.BLOCK, Opcode.LOOP, Opcode.IF):
+            b.immediates.append(None)
+    with pytest.raises(ValueError, match=message):
+        encode_expr(b)
+    with pytest.raises(ValueError, match=message):
+        b.to_instructions()
+
+
+def test_open_block_is_rejected_by_encoder():
+    """Test that a body whose blocks were never ended cannot be encoded or expanded."""
+    b = FuncBuilder()
+    b.if_()
+    b.else_()
+    with pytest.raises(ValueError, match='not closed by end'):
+        encode_binary(single_func_module('f', FuncType(params=[], results=[]), b))
+    with pytest.raises(ValueError, match='not closed by end'):
+        b.to_instructions()
+    b.end()
+    assert encode_expr(b) == bytes([0x04, 0x40, 0x05, 0x0B, 0x0B])
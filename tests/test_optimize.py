@@ -0,0 +1,125 @@
+import pytest
+
+from wasmadis import FuncBuilder, encode_binary, peephole
+from wasmadis.instructions import (
+    BlockInstruction,
+    IfInstruction,
+    Opcode,
+)
+from wasmadis.types import FuncType, ValType
+
+from tests._builders import (
+    I32_ADD,
+    I32_SUB,
+    LOCAL_GET_0,
+    RETURN,
+    i32_const,
+    single_func_module,
+)
+
+
+@pytest.mark.parametrize(
+    'body,expected',
+    [
+        ([i32_const(2), i32_const(3), I32_ADD], [i32_const(5)]),
+        ([i32_const(2), i32_const(3), I32_SUB], [i32_const(-1)]),
+        ([i32_const(1), i32_const(2), I32_ADD, i32_const(3), I32_ADD], [i32_const(6)]),
+        ([i32_const(0x7FFFFFFF), i32_const(1), I32_ADD], [i32_const(-0x80000000)]),
+        ([LOCAL_GET_0, i32_const(0), I32_ADD], [LOCAL_GET_0]),
+        ([LOCAL_GET_0, i32_const(0), I32_SUB], [LOCAL_GET_0]),
+        ([LOCAL_GET_0, i32_const(1), I32_ADD], [LOCAL_GET_0, i32_const(1), I32_ADD]),
+        ([i32_const(0), LOCAL_GET_0, I32_SUB], [i32_const(0), LOCAL_GET_0, I32_SUB]),
+        # A trailing return may also be discarding extra stack values, so it stays
+        ([LOCAL_GET_0, RETURN], [LOCAL_GET_0, RETURN]),
+    ],
+    ids=[
+        'fold-add',
+        'fold-sub',
+        'fold-chain',
+        'fold-wraps',
+        'add-zero',
+        'sub-zero',
+        'add-nonconst',
+        'zero-minus-x',
+        'keep-return',
+    ],
+)
+def test_peephole_rules(body, expected):
+    """Test each rewrite rule, and that non-matching sequences are left alone."""
+    original = list(body)
+    assert peephole(body) == expected
+    assert body == original
+
+
+def test_peephole_recurses_into_blocks():
+    """Test that block, loop and if bodies are rewritten too."""
+    body = [
+        BlockInstruction(Opcode.BLOCK, ValType.I32, [i32_const(1), i32_const(1), I32_ADD]),
+        IfInstruction(
+            Opcode.IF,
+            ValType.I32,
+            [LOCAL_GET_0, i32_const(0), I32_ADD],
+            [BlockInstruction(Opcode.LOOP, ValType.I32, [i32_const(4), i32_const(1), I32_SUB])],
+        ),
+    ]
+    assert peephole(body) == [
+        BlockInstruction(Opcode.BLOCK, ValType.I32, [i32_const(2)]),
+        IfInstruction(
+            Opcode.IF,
+            ValType.I32,
+            [LOCAL_GET_0],
+            [BlockInstruction(Opcode.LOOP, ValType.I32, [i32_const(3)])],
+        ),
+    ]
+
+
+def test_encode_binary_optimize(engine, wasmtime):
+    """Test that ``optimize=True`` shrinks the code and preserves behavior."""
+    module = single_func_module(
+        'f',
+        FuncType(params=[ValType.I32], results=[ValType.I32]),
+        [LOCAL_GET_0, i32_const(10), i32_const(20), I32_ADD, I32_ADD, i32_const(0), I32_SUB],
+    )
+    plain = encode_binary(module)
+    optimized = encode_binary(module, optimize=True)
+    assert len(optimized) < len(plain)
+    assert encode_binary(module) == plain  # The module itself is unchanged
+
+    for binary_data in (plain, optimized):
+        store = wasmtime.Store(engine)
+        instance = wasmtime.Instance(store, wasmtime.Module(engine, binary_data), [])
+        assert instance.exports(store)['f'](store, 12) == 42
+
+
+def test_encode_binary_optimize_func_builder():
+    """Test that FuncBuilder bodies are optimized as well, without changing the builder."""
+    func_type = FuncType(params=[ValType.I32], results=[ValType.I32])
+    builder = FuncBuilder()
+    builder.local_get(0)
+    builder.i32_const(0)
+    builder.i32_add()
+    expected = single_func_module('f', func_type, [LOCAL_GET_0])
+
+    assert encode_binary(single_func_module('f', func_type, builder), optimize=True) == (
+        encode_binary(expected)
+    )
+    assert len(builder) == 3
+
+
+def test_peephole_func_builder():
+    """Test that a FuncBuilder body is expanded and rewritten, as in the README example."""
+    builder = FuncBuilder()
+    builder.local_get(0)
+    builder.i32_const(0)
+    builder.i32_add()
+    builder.block(ValType.I32)
+    builder.i32_const(2)
+    builder.i32_const(3)
+    builder.i32_add()
+    builder.end()
+
+    assert peephole(builder) == [
+        LOCAL_GET_0,
+        BlockInstruction(Opcode.BLOCK, ValType.I32, [i32_const(5)]),
+    ]
+    assert len(builder) == 8
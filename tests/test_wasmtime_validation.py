@@ -1,5 +1,4 @@
 import pytest
-import wasmtime
 
 from wasmadis import Module, encode_binary, encode_text
 from wasmadis.instructions import (
@@ -7,6 +6,7 @@ from wasmadis.instructions import (
     Instruction,
     LocalInstruction,
     Opcode,
+    MemoryInstruction,
 )
 from wasmadis.sections import (
     CodeSection,
@@ -16,11 +16,23 @@ from wasmadis.sections import (
     FuncExportDesc,
     FunctionSection,
     TypeSection,
+    Import,
+    ImportSection,
+    MemImportDesc,
 )
-from wasmadis.types import FuncType, ValType
+from wasmadis.types import (
+    FuncType,
+    ValType,
+    Limits,
+    MemType,
+)
+
+from tests._builders import I32_ADD, I32_MUL, I32_SUB
 
+wasmtime = pytest.importorskip('wasmtime')
 
-def test_simple_add_function_validation():
+
+def test_simple_add_function_validation(engine):
     """Test that a simple add function can be validated by wasmtime."""
     # Create a simple WASM module with an add function
     module = Module()
@@ -44,8 +56,7 @@ def test_simple_add_function_validation():
         body=[
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
+            I32_ADD,
         ],
     )
     code_section = CodeSection(funcs=[add_func])
@@ -55,7 +66,6 @@ def test_simple_add_function_validation():
     binary_data = encode_binary(module)
 
     # This should not raise an exception if the module is valid
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     # Verify the module has the expected export
@@ -92,8 +102,7 @@ def test_text_format_generation():
         body=[
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
-            Instruction(opcode=Opcode.I32_MUL),
-            Instruction(opcode=Opcode.RETURN),
+            I32_MUL,
         ],
     )
     code_section = CodeSection(funcs=[square_func])
@@ -113,7 +122,7 @@ def test_text_format_generation():
     assert wat_text.count('(') == wat_text.count(')')
 
 
-def test_memory_operations_validation():
+def test_memory_operations_validation(engine):
     """Test a module with memory operations."""
     module = Module()
 
@@ -123,13 +132,6 @@ def test_memory_operations_validation():
     module.add_section(type_section)
 
     # Import memory (since we can't easily create a valid memory section)
-    from wasmadis.sections import (
-        Import,
-        ImportSection,
-        MemImportDesc,
-    )
-    from wasmadis.types import Limits, MemType
-
     memory_import = Import(
         module='env',
         name='memory',
@@ -149,16 +151,13 @@ def test_memory_operations_validation():
     module.add_section(export_section)
 
     # Code section - load i32 from memory
-    from wasmadis.instructions import MemoryInstruction
-
     load_func = Func(
         locals=[],
         body=[
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),  # address
             MemoryInstruction(opcode=Opcode.I32_LOAD, align=2, offset=0),
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),  # value
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
+            I32_ADD,
         ],
     )
     code_section = CodeSection(funcs=[load_func])
@@ -167,11 +166,6 @@ def test_memory_operations_validation():
     # Encode to binary
     binary_data = encode_binary(module)
 
-    # Create memory for the import
-    engine = wasmtime.Engine()
-    limits = wasmtime.Limits(1, None)
-    memory = wasmtime.Memory(wasmtime.Store(engine), wasmtime.MemoryType(limits))
-
     # Validate with wasmtime
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
@@ -179,7 +173,7 @@ def test_memory_operations_validation():
     assert wasmtime_module is not None
 
 
-def test_multiple_functions_validation():
+def test_multiple_functions_validation(engine):
     """Test a module with multiple functions."""
     module = Module()
 
@@ -208,8 +202,7 @@ def test_multiple_functions_validation():
         body=[
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),
-            Instruction(opcode=Opcode.I32_ADD),
-            Instruction(opcode=Opcode.RETURN),
+            I32_ADD,
         ],
     )
 
@@ -218,8 +211,7 @@ def test_multiple_functions_validation():
         body=[
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=0),
             LocalInstruction(opcode=Opcode.LOCAL_GET, local_idx=1),
-            Instruction(opcode=Opcode.I32_SUB),
-            Instruction(opcode=Opcode.RETURN),
+            I32_SUB,
         ],
     )
 
@@ -228,7 +220,6 @@ def test_multiple_functions_validation():
 
     # Encode and validate
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     # Test both functions
@@ -243,7 +234,7 @@ def test_multiple_functions_validation():
     assert sub_func(store, 10, 5) == 5
 
 
-def test_constants_validation():
+def test_constants_validation(engine):
     """Test a module with various constant operations."""
     module = Module()
 
@@ -265,7 +256,6 @@ def test_constants_validation():
         locals=[],
         body=[
             ConstInstruction(opcode=Opcode.F32_CONST, value=3.14159),
-            Instruction(opcode=Opcode.RETURN),
         ],
     )
     code_section = CodeSection(funcs=[pi_func])
@@ -273,7 +263,6 @@ def test_constants_validation():
 
     # Encode and validate
     binary_data = encode_binary(module)
-    engine = wasmtime.Engine()
     wasmtime_module = wasmtime.Module(engine, binary_data)
 
     # Test the function
@@ -2,6 +2,8 @@ from .module import Module
 from .types import *
 from .instructions import *
 from .sections import *
+from .func_builder import FuncBuilder
+from .optimize import peephole
 from .binary_encoder import (
     encode_binary,
     encode_uleb128,
@@ -57,6 +59,7 @@ __all__ = [
     'BlockInstruction',
     'IfInstruction',
     'MemoryInstruction',
+    'MemoryIdxInstruction',
     'AtomicMemoryInstruction',
     'RefNullInstruction',
     'RefFuncInstruction',
@@ -70,6 +73,10 @@ __all__ = [
     'RefTestInstruction',
     'RefCastInstruction',
     'BrOnCastInstruction',
+    # Compact function body builder
+    'FuncBuilder',
+    # Instruction-level optimization
+    'peephole',
     # Sections
     'SectionId',
     'Section',
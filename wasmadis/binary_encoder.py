@@ -1,11 +1,35 @@
 import struct
+from collections.abc import Sequence
+from typing import overload
 from .module import Module
 from .sections import *
 from .types import *
 from .instructions import *
+from .optimize import peephole
+from .func_builder import (
+    FuncBuilder,
+    IMMEDIATE_KINDS,
+    IMM_U32,
+    IMM_S32,
+    IMM_S64,
+    IMM_F32,
+    IMM_F64,
+    IMM_BLOCK,
+    IMM_MEMARG,
+    IMM_U32_U32,
+    IMM_BR_TABLE,
+    IMM_MEM_IDX,
+)
+
+
+# Single-byte LEB128 encodings, which cover almost every index and small constant.
+_ULEB128_SMALL = tuple(bytes([i]) for i in range(0x80))
+_SLEB128_SMALL = {i: bytes([i & 0x7F]) for i in range(-64, 64)}
 
 
 def encode_uleb128(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return _ULEB128_SMALL[value]
     result = []
     while value >= 0x80:
         result.append((value & 0x7F) | 0x80)
@@ -15,6 +39,9 @@ def encode_uleb128(value: int) -> bytes:
 
 
 def encode_sleb128(value: int) -> bytes:
+    small = _SLEB128_SMALL.get(value)
+    if small is not None:
+        return small
     result = []
     while True:
         byte = value & 0x7F
@@ -177,21 +204,12 @@ def encode_instruction(instr: Instruction) -> bytes:
         result += encode_vector(instr.label_indices, encode_uleb128)
         result += encode_uleb128(instr.default_label)
     elif isinstance(instr, BlockInstruction):
-        if instr.block_type is None:
-            result += bytes([0x40])
-        elif isinstance(instr.block_type, ValType):
-            result += encode_valtype(instr.block_type)
-        else:
-            result += encode_sleb128(instr.block_type)
-        result += encode_vector(instr.instructions, encode_instruction)
+        result += encode_blocktype(instr.block_type)
+        for block_instr in instr.instructions:
+            result += encode_instruction(block_instr)
         result += bytes([0x0B])
     elif isinstance(instr, IfInstruction):
-        if instr.block_type is None:
-            result += bytes([0x40])
-        elif isinstance(instr.block_type, ValType):
-            result += encode_valtype(instr.block_type)
-        else:
-            result += encode_sleb128(instr.block_type)
+        result += encode_blocktype(instr.block_type)
         for then_instr in instr.then_instructions:
             result += encode_instruction(then_instr)
         if instr.else_instructions:
@@ -202,6 +220,8 @@ def encode_instruction(instr: Instruction) -> bytes:
     elif isinstance(instr, MemoryInstruction):
         result += encode_uleb128(instr.align)
         result += encode_uleb128(instr.offset)
+    elif isinstance(instr, MemoryIdxInstruction):
+        result += encode_uleb128(instr.memory_idx)
     elif isinstance(instr, AtomicMemoryInstruction):
         result += encode_uleb128(instr.align)
         result += encode_uleb128(instr.offset)
@@ -238,7 +258,72 @@ def encode_instruction(instr: Instruction) -> bytes:
     return result
 
 
-def encode_expr(instructions: list[Instruction]) -> bytes:
+def encode_blocktype(block_type: ValType | int | None) -> bytes:
+    if block_type is None:
+        return bytes([0x40])
+    elif isinstance(block_type, ValType):
+        return encode_valtype(block_type)
+    return encode_sleb128(block_type)
+
+
+_IF, _ELSE, _END = Opcode.IF.value, Opcode.ELSE.value, Opcode.END.value
+
+
+def encode_func_builder(builder: FuncBuilder) -> bytes:
+    """Encode a builder's instructions, without the trailing ``end``.
+
+    Block nesting is checked as the opcodes are written, so bodies edited
+    through ``builder.opcodes`` are rejected if an ``else`` or ``end`` is
+    misplaced or a block is left open.
+    """
+    result = bytearray()
+    imms = iter(builder.immediates)
+    kinds = IMMEDIATE_KINDS
+    # Opcodes of the open blocks, innermost last; an if becomes ELSE at its else
+    open_blocks = bytearray()
+
+    for opcode in builder.opcodes:
+        result.append(opcode)
+        kind = kinds.get(opcode)
+        if kind is None:
+            if opcode == _END:
+                if not open_blocks:
+                    raise ValueError('end without an open block')
+                open_blocks.pop()
+            elif opcode == _ELSE:
+                if not open_blocks or open_blocks[-1] not in (_IF, _ELSE):
+                    raise ValueError('else outside an if block')
+                if open_blocks[-1] == _ELSE:
+                    raise ValueError('if block already has an else')
+                open_blocks[-1] = _ELSE
+            continue
+        elif kind == IMM_U32 or kind == IMM_MEM_IDX:
+            result += encode_uleb128(next(imms))
+        elif kind == IMM_S32 or kind == IMM_S64:
+            result += encode_sleb128(int(next(imms)))
+        elif kind == IMM_MEMARG or kind == IMM_U32_U32:
+            result += encode_uleb128(next(imms))
+            result += encode_uleb128(next(imms))
+        elif kind == IMM_BLOCK:
+            open_blocks.append(opcode)
+            result += encode_blocktype(next(imms))
+        elif kind == IMM_F32:
+            result += encode_f32(float(next(imms)))
+        elif kind == IMM_F64:
+            result += encode_f64(float(next(imms)))
+        elif kind == IMM_BR_TABLE:
+            result += encode_vector(next(imms), encode_uleb128)
+            result += encode_uleb128(next(imms))
+
+    if open_blocks:
+        raise ValueError(f'{len(open_blocks)} block(s) not closed by end')
+    return bytes(result)
+
+
+def encode_expr(instructions: Sequence[Instruction] | FuncBuilder) -> bytes:
+    if isinstance(instructions, FuncBuilder):
+        return encode_func_builder(instructions) + bytes([0x0B])
+
     result = b''
     for instr in instructions:
         result += encode_instruction(instr)
@@ -246,7 +331,7 @@ def encode_expr(instructions: list[Instruction]) -> bytes:
     return result
 
 
-def encode_section(section: Section) -> bytes:
+def encode_section(section: Section, optimize: bool = False) -> bytes:
     section_data = b''
 
     if isinstance(section, CustomSection):
@@ -339,7 +424,7 @@ def encode_section(section: Section) -> bytes:
             func_data = encode_vector(
                 func.locals, lambda l: encode_uleb128(l.count) + encode_valtype(l.val_type)
             )
-            func_data += encode_expr(func.body)
+            func_data += encode_expr(peephole(func.body) if optimize else func.body)
             return encode_uleb128(len(func_data)) + func_data
 
         section_data = encode_vector(section.funcs, encode_func)
@@ -363,11 +448,29 @@ def encode_section(section: Section) -> bytes:
     return bytes([section.id.value]) + encode_uleb128(len(section_data)) + section_data  # type: ignore[attr-defined]
 
 
-def encode_binary(module: Module) -> bytes:
-    result = b'\x00asm'
+@overload
+def encode_binary(module: Module, out: None = None, *, optimize: bool = False) -> bytes: ...
+
+
+@overload
+def encode_binary(module: Module, out: bytearray, *, optimize: bool = False) -> bytearray: ...
+
+
+def encode_binary(
+    module: Module, out: bytearray | None = None, *, optimize: bool = False
+) -> bytes | bytearray:
+    """Encode ``module`` in the WebAssembly binary format.
+
+    If ``out`` is given, the encoding is appended to it and ``out`` itself is
+    returned, so callers can reuse one buffer across many modules. With
+    ``optimize``, every function body goes through ``peephole`` first; the
+    module itself is not modified.
+    """
+    result = bytearray() if out is None else out
+    result += b'\x00asm'
     result += struct.pack('<I', module.version)
 
     for section in module.sections:
-        result += encode_section(section)
+        result += encode_section(section, optimize)
 
-    return result
+    return bytes(result) if out is None else result
@@ -0,0 +1,291 @@
+from typing import Any
+
+from .instructions import (
+    BlockInstruction,
+    BrInstruction,
+    BrTableInstruction,
+    CallIndirectInstruction,
+    CallInstruction,
+    ConstInstruction,
+    GlobalInstruction,
+    IfInstruction,
+    Instruction,
+    LocalInstruction,
+    MemoryIdxInstruction,
+    MemoryInstruction,
+    Opcode,
+    ReturnCallIndirectInstruction,
+    ReturnCallInstruction,
+)
+from .types import ValType
+
+# Immediate layout of each single-byte opcode the builder accepts. Opcodes not
+# listed here take no immediates.
+IMM_U32 = 1  # one unsigned LEB128 index
+IMM_S32 = 2  # i32.const
+IMM_S64 = 3  # i64.const
+IMM_F32 = 4
+IMM_F64 = 5
+IMM_BLOCK = 6  # block type
+IMM_MEMARG = 7  # align, offset
+IMM_U32_U32 = 8  # type index, table index
+IMM_BR_TABLE = 9  # label list, default label
+IMM_MEM_IDX = 10  # memory.size / memory.grow
+
+IMMEDIATE_KINDS: dict[int, int] = {
+    Opcode.BLOCK.value: IMM_BLOCK,
+    Opcode.LOOP.value: IMM_BLOCK,
+    Opcode.IF.value: IMM_BLOCK,
+    Opcode.BR.value: IMM_U32,
+    Opcode.BR_IF.value: IMM_U32,
+    Opcode.BR_TABLE.value: IMM_BR_TABLE,
+    Opcode.CALL.value: IMM_U32,
+    Opcode.CALL_INDIRECT.value: IMM_U32_U32,
+    Opcode.RETURN_CALL.value: IMM_U32,
+    Opcode.RETURN_CALL_INDIRECT.value: IMM_U32_U32,
+    Opcode.LOCAL_GET.value: IMM_U32,
+    Opcode.LOCAL_SET.value: IMM_U32,
+    Opcode.LOCAL_TEE.value: IMM_U32,
+    Opcode.GLOBAL_GET.value: IMM_U32,
+    Opcode.GLOBAL_SET.value: IMM_U32,
+    Opcode.MEMORY_SIZE.value: IMM_MEM_IDX,
+    Opcode.MEMORY_GROW.value: IMM_MEM_IDX,
+    Opcode.I32_CONST.value: IMM_S32,
+    Opcode.I64_CONST.value: IMM_S64,
+    Opcode.F32_CONST.value: IMM_F32,
+    Opcode.F64_CONST.value: IMM_F64,
+}
+for _opcode in range(Opcode.I32_LOAD.value, Opcode.I64_STORE32.value + 1):
+    IMMEDIATE_KINDS[_opcode] = IMM_MEMARG
+del _opcode
+
+# Single-byte opcodes that take immediates the builder has no method for. They
+# are rejected by op(), which would otherwise write them without immediates.
+UNSUPPORTED_OPCODES = frozenset(
+    opcode.value
+    for opcode in (
+        Opcode.SELECT_T,
+        Opcode.TABLE_GET,
+        Opcode.TABLE_SET,
+        Opcode.REF_NULL,
+        Opcode.REF_FUNC,
+        Opcode.BR_ON_NULL,
+        Opcode.BR_ON_NON_NULL,
+    )
+)
+
+
+class FuncBuilder:
+    """Append-only function body stored as parallel opcode/immediate arrays.
+
+    ``opcodes`` holds one byte per instruction and ``immediates`` holds their
+    operands, flattened in order. A builder can be used directly as a
+    ``Func.body``; the binary encoder writes it out without creating an
+    ``Instruction`` object per instruction.
+
+    Only single-byte opcodes are supported. Structured control flow is
+    written as in the binary format, with explicit ``else_`` and ``end``
+    calls; the function's final ``end`` is added by the encoder.
+    """
+
+    __slots__ = ('opcodes', 'immediates', '_open')
+
+    def __init__(self):
+        self.opcodes = bytearray()
+        self.immediates: list = []
+        # Opcodes of the blocks opened but not yet ended, innermost last; an
+        # if_() is replaced by ELSE once its else_() has been written
+        self._open: list[Opcode] = []
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def op(self, opcode: Opcode):
+        """Append an instruction that takes no immediates."""
+        value = opcode.value
+        if value > 0xFF or value in IMMEDIATE_KINDS or value in UNSUPPORTED_OPCODES:
+            raise ValueError(f'{opcode.name} cannot be appended with op()')
+        if opcode == Opcode.END:
+            self.end()
+        elif opcode == Opcode.ELSE:
+            self.else_()
+        else:
+            self.opcodes.append(value)
+
+    def _append(self, opcode: Opcode, *immediates):
+        self.opcodes.append(opcode.value)
+        self.immediates.extend(immediates)
+
+    # Control flow
+
+    def block(self, block_type: ValType | int | None = None):
+        self._append(Opcode.BLOCK, block_type)
+        self._open.append(Opcode.BLOCK)
+
+    def loop(self, block_type: ValType | int | None = None):
+        self._append(Opcode.LOOP, block_type)
+        self._open.append(Opcode.LOOP)
+
+    def if_(self, block_type: ValType | int | None = None):
+        self._append(Opcode.IF, block_type)
+        self._open.append(Opcode.IF)
+
+    def else_(self):
+        """Start the else branch of the innermost open block, which must be an ``if_()``."""
+        if self._open and self._open[-1] == Opcode.ELSE:
+            raise ValueError('if_() block already has an else_()')
+        if not self._open or self._open[-1] != Opcode.IF:
+            raise ValueError('else_() outside an if_() block')
+        self.opcodes.append(Opcode.ELSE.value)
+        self._open[-1] = Opcode.ELSE
+
+    def end(self):
+        """Close the innermost open block; the function's own ``end`` is added by the encoder."""
+        if not self._open:
+            raise ValueError('end() without an open block')
+        self.opcodes.append(Opcode.END.value)
+        self._open.pop()
+
+    def br(self, label_idx: int):
+        self._append(Opcode.BR, label_idx)
+
+    def br_if(self, label_idx: int):
+        self._append(Opcode.BR_IF, label_idx)
+
+    def br_table(self, label_indices: list[int], default_label: int):
+        self._append(Opcode.BR_TABLE, tuple(label_indices), default_label)
+
+    def ret(self):
+        self.opcodes.append(Opcode.RETURN.value)
+
+    def call(self, func_idx: int):
+        self._append(Opcode.CALL, func_idx)
+
+    def call_indirect(self, type_idx: int, table_idx: int = 0):
+        self._append(Opcode.CALL_INDIRECT, type_idx, table_idx)
+
+    def return_call(self, func_idx: int):
+        self._append(Opcode.RETURN_CALL, func_idx)
+
+    def return_call_indirect(self, type_idx: int, table_idx: int = 0):
+        self._append(Opcode.RETURN_CALL_INDIRECT, type_idx, table_idx)
+
+    def drop(self):
+        self.opcodes.append(Opcode.DROP.value)
+
+    # Variables
+
+    def local_get(self, local_idx: int):
+        self._append(Opcode.LOCAL_GET, local_idx)
+
+    def local_set(self, local_idx: int):
+        self._append(Opcode.LOCAL_SET, local_idx)
+
+    def local_tee(self, local_idx: int):
+        self._append(Opcode.LOCAL_TEE, local_idx)
+
+    def global_get(self, global_idx: int):
+        self._append(Opcode.GLOBAL_GET, global_idx)
+
+    def global_set(self, global_idx: int):
+        self._append(Opcode.GLOBAL_SET, global_idx)
+
+    # Memory
+
+    def memory_op(self, opcode: Opcode, align: int, offset: int = 0):
+        """Append a load or store with the given memarg."""
+        if IMMEDIATE_KINDS.get(opcode.value) != IMM_MEMARG:
+            raise ValueError(f'{opcode.name} is not a load or store')
+        self._append(opcode, align, offset)
+
+    def memory_size(self, memory_idx: int = 0):
+        self._append(Opcode.MEMORY_SIZE, memory_idx)
+
+    def memory_grow(self, memory_idx: int = 0):
+        self._append(Opcode.MEMORY_GROW, memory_idx)
+
+    # Constants and common numeric instructions
+
+    def i32_const(self, value: int):
+        self._append(Opcode.I32_CONST, value)
+
+    def i64_const(self, value: int):
+        self._append(Opcode.I64_CONST, value)
+
+    def f32_const(self, value: float):
+        self._append(Opcode.F32_CONST, value)
+
+    def f64_const(self, value: float):
+        self._append(Opcode.F64_CONST, value)
+
+    def i32_add(self):
+        self.opcodes.append(Opcode.I32_ADD.value)
+
+    def i32_sub(self):
+        self.opcodes.append(Opcode.I32_SUB.value)
+
+    def i32_mul(self):
+        self.opcodes.append(Opcode.I32_MUL.value)
+
+    def to_instructions(self) -> list[Instruction]:
+        """Expand the body into the equivalent nested ``Instruction`` list."""
+        result: list[Instruction] = []
+        # Open blocks as (enclosing list, opcode, block type, bodies); the
+        # instruction is created at its ``end``, once all bodies are known.
+        stack: list[tuple[list[Instruction], Opcode, Any, list[list[Instruction]]]] = []
+        current = result
+        imms = iter(self.immediates)
+
+        for value in self.opcodes:
+            opcode = Opcode(value)
+            kind = IMMEDIATE_KINDS.get(value)
+
+            if opcode in (Opcode.BLOCK, Opcode.LOOP, Opcode.IF):
+                body: list[Instruction] = []
+                stack.append((current, opcode, next(imms), [body]))
+                current = body
+            elif opcode == Opcode.ELSE:
+                if not stack or stack[-1][1] != Opcode.IF:
+                    raise ValueError('else outside an if block')
+                if len(stack[-1][3]) > 1:
+                    raise ValueError('if block already has an else')
+                current = []
+                stack[-1][3].append(current)
+            elif opcode == Opcode.END:
+                if not stack:
+                    raise ValueError('end without an open block')
+                parent, block_opcode, block_type, bodies = stack.pop()
+                if block_opcode == Opcode.IF:
+                    else_body = bodies[1] if len(bodies) > 1 else None
+                    parent.append(IfInstruction(block_opcode, block_type, bodies[0], else_body))
+                else:
+                    parent.append(BlockInstruction(block_opcode, block_type, bodies[0]))
+                current = parent
+            elif kind in (IMM_S32, IMM_S64, IMM_F32, IMM_F64):
+                current.append(ConstInstruction(opcode, next(imms)))
+            elif opcode in (Opcode.LOCAL_GET, Opcode.LOCAL_SET, Opcode.LOCAL_TEE):
+                current.append(LocalInstruction(opcode, next(imms)))
+            elif opcode in (Opcode.GLOBAL_GET, Opcode.GLOBAL_SET):
+                current.append(GlobalInstruction(opcode, next(imms)))
+            elif opcode == Opcode.CALL:
+                current.append(CallInstruction(opcode, next(imms)))
+            elif opcode == Opcode.RETURN_CALL:
+                current.append(ReturnCallInstruction(opcode, next(imms)))
+            elif opcode == Opcode.CALL_INDIRECT:
+                current.append(CallIndirectInstruction(opcode, next(imms), next(imms)))
+            elif opcode == Opcode.RETURN_CALL_INDIRECT:
+                current.append(ReturnCallIndirectInstruction(opcode, next(imms), next(imms)))
+            elif kind == IMM_U32:
+                current.append(BrInstruction(opcode, next(imms)))
+            elif kind == IMM_BR_TABLE:
+                current.append(BrTableInstruction(opcode, list(next(imms)), next(imms)))
+            elif kind == IMM_MEMARG:
+                current.append(MemoryInstruction(opcode, next(imms), next(imms)))
+            elif kind == IMM_MEM_IDX:
+                current.append(MemoryIdxInstruction(opcode, next(imms)))
+            else:
+                current.append(Instruction(opcode))
+
+        if stack:
+            raise ValueError(f'{len(stack)} block(s) not closed by end')
+        return result
@@ -293,145 +293,151 @@ class GCOpcode(Enum):
     I31_GET_U = 0xFB1C
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     opcode: Opcode | AtomicOpcode | GCOpcode
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstInstruction(Instruction):
     value: int | float
 
 
-@dataclass
+@dataclass(slots=True)
 class LocalInstruction(Instruction):
     local_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalInstruction(Instruction):
     global_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CallInstruction(Instruction):
     func_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CallIndirectInstruction(Instruction):
     type_idx: int
     table_idx: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnCallInstruction(Instruction):
     func_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnCallIndirectInstruction(Instruction):
     type_idx: int
     table_idx: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class BrInstruction(Instruction):
     label_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BrTableInstruction(Instruction):
     label_indices: list[int]
     default_label: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockInstruction(Instruction):
     block_type: ValType | int | None
     instructions: list[Instruction]
 
 
-@dataclass
+@dataclass(slots=True)
 class IfInstruction(Instruction):
     block_type: ValType | int | None
     then_instructions: list[Instruction]
     else_instructions: list[Instruction] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryInstruction(Instruction):
     align: int
     offset: int
     memory_idx: int = 0
 
 
-@dataclass
+# memory.size and memory.grow, whose only immediate is a memory index
+@dataclass(slots=True)
+class MemoryIdxInstruction(Instruction):
+    memory_idx: int = 0
+
+
+@dataclass(slots=True)
 class AtomicMemoryInstruction(Instruction):
     align: int
     offset: int
     memory_idx: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class RefNullInstruction(Instruction):
     ref_type: RefType
 
 
-@dataclass
+@dataclass(slots=True)
 class RefFuncInstruction(Instruction):
     func_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class StructNewInstruction(Instruction):
     type_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class StructGetInstruction(Instruction):
     type_idx: int
     field_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class StructSetInstruction(Instruction):
     type_idx: int
     field_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrayNewInstruction(Instruction):
     type_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrayGetInstruction(Instruction):
     type_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ArraySetInstruction(Instruction):
     type_idx: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrayNewFixedInstruction(Instruction):
     type_idx: int
     size: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RefTestInstruction(Instruction):
     ref_type: RefType
 
 
-@dataclass
+@dataclass(slots=True)
 class RefCastInstruction(Instruction):
     ref_type: RefType
 
 
-@dataclass
+@dataclass(slots=True)
 class BrOnCastInstruction(Instruction):
     label_idx: int
     ref_type_from: RefType
@@ -0,0 +1,63 @@
+import operator
+from collections.abc import Sequence
+from dataclasses import replace
+
+from .func_builder import FuncBuilder
+from .instructions import BlockInstruction, ConstInstruction, IfInstruction, Instruction, Opcode
+
+
+# Binary i32 instructions folded when both operands are constants; ``x op 0`` is ``x`` for each
+_I32_FOLDABLE = {
+    Opcode.I32_ADD: operator.add,
+    Opcode.I32_SUB: operator.sub,
+}
+
+
+def _wrap_i32(value: int) -> int:
+    """Reduce ``value`` to the signed i32 it denotes after wraparound."""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def _is_i32_const(instr: Instruction) -> bool:
+    return isinstance(instr, ConstInstruction) and instr.opcode == Opcode.I32_CONST
+
+
+def peephole(body: Sequence[Instruction] | FuncBuilder) -> list[Instruction]:
+    """Return a copy of ``body`` with simple local rewrites applied.
+
+    - ``i32.const a; i32.const b; i32.add`` (or ``i32.sub``) folds to one ``i32.const``
+    - ``i32.const 0; i32.add`` and ``i32.const 0; i32.sub`` are removed
+
+    Block, loop and if bodies are rewritten recursively. A trailing ``return`` is
+    kept: it also discards any extra values left on the stack, so whether it can
+    be dropped depends on stack heights this pass does not track.
+
+    A ``FuncBuilder`` body is expanded with ``to_instructions()`` first; the
+    builder itself is not modified.
+    """
+    if isinstance(body, FuncBuilder):
+        body = body.to_instructions()
+    result: list[Instruction] = []
+    for instr in body:
+        if isinstance(instr, BlockInstruction):
+            instr = replace(instr, instructions=peephole(instr.instructions))
+        elif isinstance(instr, IfInstruction):
+            else_body = instr.else_instructions
+            instr = replace(
+                instr,
+                then_instructions=peephole(instr.then_instructions),
+                else_instructions=None if else_body is None else peephole(else_body),
+            )
+        elif instr.opcode in _I32_FOLDABLE and result and _is_i32_const(result[-1]):
+            rhs = result[-1].value  # type: ignore[attr-defined]
+            if len(result) > 1 and _is_i32_const(result[-2]):
+                lhs = result[-2].value  # type: ignore[attr-defined]
+                value = _I32_FOLDABLE[instr.opcode](int(lhs), int(rhs))
+                result[-2:] = [ConstInstruction(Opcode.I32_CONST, _wrap_i32(value))]
+                continue
+            if rhs == 0:
+                result.pop()
+                continue
+        result.append(instr)
+    return result
@@ -1,7 +1,9 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
 from .types import *
 from .instructions import Instruction
+from .func_builder import FuncBuilder
 
 
 class SectionId(Enum):
@@ -41,6 +43,14 @@ class TypeSection(Section):
     def __post_init__(self):
         self.id = SectionId.TYPE
 
+    def add_type(self, composite_type: CompositeType) -> int:
+        """Return the index of ``composite_type``, appending it only if no equal type exists."""
+        for i, existing in enumerate(self.types):
+            if existing == composite_type:
+                return i
+        self.types.append(composite_type)
+        return len(self.types) - 1
+
 
 @dataclass
 class ImportDesc:
@@ -222,7 +232,7 @@ class Locals:
 @dataclass
 class Func:
     locals: list[Locals]
-    body: list[Instruction]
+    body: Sequence[Instruction] | FuncBuilder
 
 
 @dataclass
@@ -1,7 +1,9 @@
+from collections.abc import Sequence
 from .module import Module
 from .sections import *
 from .types import *
 from .instructions import *
+from .func_builder import FuncBuilder
 
 
 def indent(text: str, level: int = 1) -> str:
@@ -398,6 +400,9 @@ def format_instruction(instr: Instruction, indent_level: int = 0) -> str:
             result += f' offset={instr.offset}'
         if instr.align != 0:
             result += f' align={1 << instr.align}'
+    elif isinstance(instr, MemoryIdxInstruction):
+        if instr.memory_idx != 0:
+            result += f' {instr.memory_idx}'
     elif isinstance(instr, AtomicMemoryInstruction):
         if instr.offset != 0:
             result += f' offset={instr.offset}'
@@ -431,7 +436,9 @@ def format_instruction(instr: Instruction, indent_level: int = 0) -> str:
     return result
 
 
-def format_expr(instructions: list[Instruction]) -> str:
+def format_expr(instructions: Sequence[Instruction] | FuncBuilder) -> str:
+    if isinstance(instructions, FuncBuilder):
+        instructions = instructions.to_instructions()
     return '\n'.join(format_instruction(instr) for instr in instructions)
 
 